@@ -12,14 +12,118 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit, prange  # also enables pandas' numba groupby engine
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401 - enables Arrow-backed string columns
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+def _alert_masks_numpy(delay, risk, delay_threshold, risk_threshold):
+    """
+    Row masks for the delay and risk alerts
+    """
+    return delay > delay_threshold, risk > risk_threshold
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _alert_masks_numba(delay, risk, delay_threshold, risk_threshold):
+        """
+        Both alert masks in one fused, parallel pass over the raw columns
+        """
+        n = delay.shape[0]
+        high_delay = np.empty(n, dtype=np.bool_)
+        high_risk = np.empty(n, dtype=np.bool_)
+        for i in prange(n):
+            high_delay[i] = delay[i] > delay_threshold
+            high_risk[i] = risk[i] > risk_threshold
+        return high_delay, high_risk
+
+def _top_n(totals, n):
+    """
+    Largest n grouped totals via np.partition instead of a full sort; ties are
+    broken by key, as with a sorted groupby followed by nlargest
+    """
+    values = totals.to_numpy()
+    if len(values) > n:
+        kth_largest = np.partition(values, len(values) - n)[len(values) - n]
+        totals = totals[values >= kth_largest]
+    return totals.sort_index().sort_values(ascending=False, kind='stable').head(n)
+
+def format_material_ids(material_ids):
+    """
+    Display labels (MAT_<id>) for integer Material_IDs; meant for small result sets only
+    """
+    return [f'MAT_{material_id}' for material_id in material_ids]
+
+def _to_arrow_strings(df):
+    """
+    Store plain-text columns as Arrow-backed strings (contiguous buffers instead of Python objects)
+    """
+    if not ARROW_AVAILABLE:
+        return df
+    text_cols = [col for col in df.columns
+                 if pd.api.types.is_string_dtype(df[col]) and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if text_cols:
+        df[text_cols] = df[text_cols].astype('string[pyarrow]')
+    return df
+
+def _bin_to_categorical(values, bins, labels):
+    """
+    Right-closed binning equivalent to pd.cut, done with np.digitize on the raw array
+    """
+    bins = np.asarray(bins, dtype=np.float64)
+    codes = np.digitize(values, bins, right=True) - 1
+    # Values outside (bins[0], bins[-1]] become NaN, as with pd.cut
+    codes[(codes < 0) | (codes >= len(labels))] = -1
+    return pd.Categorical.from_codes(codes, categories=pd.Index(labels), ordered=True)
+
 class SupplyChainAnalyzer:
     """
     A class for processing and analyzing supply chain component health data
     """
     
-    def __init__(self):
+    def __init__(self, use_numba=False):
+        if use_numba and not NUMBA_AVAILABLE:
+            raise ImportError("use_numba=True requires numba to be installed.")
         self.data = None
         self.processed_data = None
+        self.use_numba = use_numba
+        
+        # Groupby reductions run on the numba engine only when asked for; compiling the kernels
+        # costs seconds per process and only pays off on very large datasets
+        self.agg_engine = 'numba' if use_numba else None
+        self.agg_engine_kwargs = {'parallel': True, 'nogil': True} if use_numba else None
+        if use_numba:
+            self._warm_numba_cache()
+        
+    def _warm_numba_cache(self):
+        """
+        Compile the numba groupby kernels up front so the first analysis doesn't pay for it
+        """
+        # Kernels specialize per dtype, so warm the (dtype, reduction) pairs the analyses use on
+        # the sample data; integer counts are downcast by value, so other data may compile more
+        warmup_reductions = [('int8', 'sum'), ('int8', 'mean'), ('int16', 'sum'),
+                             ('float32', 'sum'), ('float32', 'mean')]
+        warmup = pd.DataFrame({'key': [0, 0, 1]})
+        for dtype in {dtype for dtype, _ in warmup_reductions}:
+            warmup[dtype] = np.arange(3, dtype=dtype)
+        grouped = warmup.groupby('key')
+        for dtype, func in warmup_reductions:
+            self._reduce(grouped, dtype, func)
+        _alert_masks_numba(np.zeros(1, dtype=np.int8), np.zeros(1), 15, 4.0)
+    
+    def _reduce(self, grouped, column, func):
+        """
+        Apply a sum/mean reduction to one column of a groupby using the configured engine
+        """
+        return getattr(grouped[column], func)(engine=self.agg_engine,
+                                              engine_kwargs=self.agg_engine_kwargs)
         
     def generate_sample_data(self, num_records=1000):
         """
@@ -38,25 +142,26 @@ class SupplyChainAnalyzer:
         material_groups = ['WWMG', 'CCG']
         priority_levels = [2, 3, 4, 5]
         planners = [f'Planner_{i:02d}' for i in range(1, 21)]
-        
-        data = []
-        
-        for _ in range(num_records):
-            record = {
-                'Date': np.random.choice(date_range),
-                'Market': np.random.choice(markets),
-                'Material_Group': np.random.choice(material_groups),
-                'Material_ID': f'MAT_{np.random.randint(10000, 99999)}',
-                'Planner': np.random.choice(planners),
-                'Priority_Level': np.random.choice(priority_levels),
-                'Tracking_Count': np.random.poisson(15),
-                'ESD_Planning_Status': np.random.choice(['On_Time', 'Late_7_days', 'Late_15_days', 'Late_30_days']),
-                'Market_Max_Qty': np.random.exponential(100),
-                'Supply_Risk_Score': np.random.uniform(1, 5)
-            }
-            data.append(record)
-        
-        self.data = pd.DataFrame(data)
+        esd_statuses = ['On_Time', 'Late_7_days', 'Late_15_days', 'Late_30_days']
+
+        # Draw each column in a single vectorized call
+        n = num_records
+        # Material IDs stay numeric; the MAT_ label is only built for displayed results
+        material_ids = np.random.randint(10000, 99999, size=n).astype(np.int32)
+
+        self.data = pd.DataFrame({
+            'Date': np.random.choice(date_range.values, size=n),
+            'Market': np.random.choice(markets, size=n),
+            'Material_Group': np.random.choice(material_groups, size=n),
+            'Material_ID': material_ids,
+            'Planner': np.random.choice(planners, size=n),
+            'Priority_Level': np.random.choice(priority_levels, size=n),
+            'Tracking_Count': np.random.poisson(15, size=n),
+            'ESD_Planning_Status': np.random.choice(esd_statuses, size=n),
+            'Market_Max_Qty': np.random.exponential(100, size=n),
+            'Supply_Risk_Score': np.random.uniform(1, 5, size=n)
+        })
+        self.data = _to_arrow_strings(self.data)
         return self.data
     
     def clean_and_process_data(self):
@@ -74,18 +179,43 @@ class SupplyChainAnalyzer:
         df['Week'] = df['Date'].dt.isocalendar().week
         
         # Create derived metrics
-        df['Risk_Category'] = pd.cut(df['Supply_Risk_Score'], 
-                                   bins=[0, 2, 3, 4, 5], 
-                                   labels=['Low', 'Medium', 'High', 'Critical'])
+        df['Risk_Category'] = _bin_to_categorical(df['Supply_Risk_Score'].to_numpy(),
+                                                  bins=[0, 2, 3, 4, 5],
+                                                  labels=['Low', 'Medium', 'High', 'Critical'])
         
         # Market Max Quantity categories
-        df['Qty_Category'] = pd.cut(df['Market_Max_Qty'], 
-                                  bins=[0, 50, 150, 300, float('inf')], 
-                                  labels=['Small', 'Medium', 'Large', 'XLarge'])
+        df['Qty_Category'] = _bin_to_categorical(df['Market_Max_Qty'].to_numpy(),
+                                                 bins=[0, 50, 150, 300, float('inf')],
+                                                 labels=['Small', 'Medium', 'Large', 'XLarge'])
         
         # ESD Planning delay in days
         esdmapping = {'On_Time': 0, 'Late_7_days': 7, 'Late_15_days': 15, 'Late_30_days': 30}
-        df['Planning_Delay_Days'] = df['ESD_Planning_Status'].map(esdmapping)
+        status_present = df['ESD_Planning_Status'].notna().to_numpy()
+        df['ESD_Planning_Status'] = pd.Categorical(df['ESD_Planning_Status'], categories=list(esdmapping))
+        esd_codes = df['ESD_Planning_Status'].cat.codes.to_numpy()
+        missing_status = esd_codes < 0
+        if (missing_status & status_present).any():
+            raise ValueError("Unknown ESD planning status found in data.")
+        delay_lookup = np.array(list(esdmapping.values()), dtype=np.int8)
+        planning_delay = delay_lookup[esd_codes]
+        if missing_status.any():
+            # Missing statuses have no delay, as with the original dict mapping
+            planning_delay = np.where(missing_status, np.nan, planning_delay)
+        df['Planning_Delay_Days'] = planning_delay
+        
+        # Low-cardinality labels as categoricals so groupby works on integer codes
+        for col in ['Market', 'Material_Group', 'Planner']:
+            df[col] = df[col].astype('category')
+        
+        # Narrowest safe numeric dtypes, applied after the derived bins so they see full precision;
+        # integer counts shrink only as far as their actual values fit, and columns with
+        # missing values keep their wide dtype
+        for col in ['Priority_Level', 'Tracking_Count']:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        df = df.astype({
+            'Supply_Risk_Score': 'float32',
+            'Market_Max_Qty': 'float32'
+        })
         
         self.processed_data = df
         return df
@@ -96,32 +226,46 @@ class SupplyChainAnalyzer:
         """
         df = self.processed_data
         
+        # Single scan at (Date, Market) grain; daily figures roll up from it
+        gb_date_market = df.groupby(['Date', 'Market'], observed=True)
+        date_market = pd.DataFrame({
+            'Tracking_Count': self._reduce(gb_date_market, 'Tracking_Count', 'sum'),
+            'Market_Max_Qty': self._reduce(gb_date_market, 'Market_Max_Qty', 'sum'),
+            'Priority_Sum': self._reduce(gb_date_market, 'Priority_Level', 'sum'),
+            'Delay_Sum': self._reduce(gb_date_market, 'Planning_Delay_Days', 'sum'),
+            'Risk_Sum': self._reduce(gb_date_market, 'Supply_Risk_Score', 'sum'),
+            # Non-null counts per averaged column, so the daily means skip NaN like mean() does
+            'Priority_Count': gb_date_market['Priority_Level'].count(),
+            'Delay_Count': gb_date_market['Planning_Delay_Days'].count(),
+            'Risk_Count': gb_date_market['Supply_Risk_Score'].count()
+        })
+
         # Overall trend metrics by date
-        daily_trends = df.groupby('Date').agg({
-            'Tracking_Count': 'sum',
-            'Priority_Level': 'mean',
-            'Planning_Delay_Days': 'mean',
-            'Supply_Risk_Score': 'mean'
+        daily = date_market.groupby(level='Date').sum()
+        daily_trends = pd.DataFrame({
+            'Tracking_Count': daily['Tracking_Count'],
+            'Priority_Level': daily['Priority_Sum'] / daily['Priority_Count'],
+            'Planning_Delay_Days': daily['Delay_Sum'] / daily['Delay_Count'],
+            'Supply_Risk_Score': daily['Risk_Sum'] / daily['Risk_Count']
         }).reset_index()
-        
+
         # Market-wise analysis
-        market_trends = df.groupby(['Date', 'Market']).agg({
-            'Tracking_Count': 'sum',
-            'Market_Max_Qty': 'sum'
-        }).reset_index()
+        market_trends = date_market[['Tracking_Count', 'Market_Max_Qty']].reset_index()
         
         # Material group analysis
-        material_trends = df.groupby(['Year_Month', 'Material_Group']).agg({
-            'Tracking_Count': 'sum',
-            'Priority_Level': 'mean',
-            'Planning_Delay_Days': 'mean'
+        gb_material = df.groupby(['Year_Month', 'Material_Group'], observed=True)
+        material_trends = pd.DataFrame({
+            'Tracking_Count': self._reduce(gb_material, 'Tracking_Count', 'sum'),
+            'Priority_Level': self._reduce(gb_material, 'Priority_Level', 'mean'),
+            'Planning_Delay_Days': self._reduce(gb_material, 'Planning_Delay_Days', 'mean')
         }).reset_index()
         
         # Planner performance metrics
-        planner_performance = df.groupby('Planner').agg({
-            'Tracking_Count': 'sum',
-            'Planning_Delay_Days': 'mean',
-            'Supply_Risk_Score': 'mean'
+        gb_planner = df.groupby('Planner', observed=True)
+        planner_performance = pd.DataFrame({
+            'Tracking_Count': self._reduce(gb_planner, 'Tracking_Count', 'sum'),
+            'Planning_Delay_Days': self._reduce(gb_planner, 'Planning_Delay_Days', 'mean'),
+            'Supply_Risk_Score': self._reduce(gb_planner, 'Supply_Risk_Score', 'mean')
         }).round(2)
         
         return {
@@ -140,33 +284,44 @@ class SupplyChainAnalyzer:
         # Define alert conditions
         alerts = []
         
+        # Row-level alert masks computed in one pass over the raw arrays
+        alert_masks = _alert_masks_numba if self.use_numba else _alert_masks_numpy
+        high_delay, high_risk = alert_masks(df['Planning_Delay_Days'].to_numpy(),
+                                            df['Supply_Risk_Score'].to_numpy(dtype=np.float64),
+                                            15, 4.0)
+        
         # High delay alerts
-        high_delay = df[df['Planning_Delay_Days'] > 15]
-        if not high_delay.empty:
+        high_delay_count = int(high_delay.sum())
+        if high_delay_count:
+            # Unique planners found on the integer category codes, then looked up once
+            planner_codes = pd.unique(df['Planner'].cat.codes.to_numpy()[high_delay])
             alerts.append({
                 'Alert_Type': 'High_Planning_Delay',
-                'Count': len(high_delay),
-                'Affected_Planners': high_delay['Planner'].unique().tolist()
+                'Count': high_delay_count,
+                'Affected_Planners': df['Planner'].cat.categories.take(planner_codes).tolist()
             })
         
         # High risk score alerts
-        high_risk = df[df['Supply_Risk_Score'] > 4.0]
-        if not high_risk.empty:
+        high_risk_count = int(high_risk.sum())
+        if high_risk_count:
             alerts.append({
                 'Alert_Type': 'High_Supply_Risk',
-                'Count': len(high_risk),
-                'Affected_Materials': high_risk['Material_ID'].unique()[:10].tolist()
+                'Count': high_risk_count,
+                'Affected_Materials': format_material_ids(df['Material_ID'][high_risk].unique()[:10])
             })
         
-        # Low tracking volume (potential issues)
-        daily_tracking = df.groupby('Date')['Tracking_Count'].sum()
-        low_tracking_days = daily_tracking[daily_tracking < daily_tracking.quantile(0.1)]
+        # Low tracking volume (potential issues), summing per day on factorized date codes
+        date_codes, dates = pd.factorize(df['Date'], sort=True)
+        daily_tracking = np.bincount(date_codes, weights=df['Tracking_Count'].to_numpy(),
+                                     minlength=len(dates))
+        low_tracking = daily_tracking < np.quantile(daily_tracking, 0.1)
+        low_tracking_days = dates[low_tracking]
         
-        if not low_tracking_days.empty:
+        if len(low_tracking_days):
             alerts.append({
                 'Alert_Type': 'Low_Tracking_Volume',
                 'Count': len(low_tracking_days),
-                'Dates': low_tracking_days.index.strftime('%Y-%m-%d').tolist()
+                'Dates': np.datetime_as_string(low_tracking_days.to_numpy(), unit='D').tolist()
             })
         
         return alerts
@@ -178,13 +333,16 @@ class SupplyChainAnalyzer:
         df = self.processed_data
         
         # Top 10 materials by tracking count
-        top_materials = df.groupby('Material_ID')['Tracking_Count'].sum().nlargest(10)
+        material_totals = self._reduce(df.groupby('Material_ID', sort=False), 'Tracking_Count', 'sum')
+        top_materials = _top_n(material_totals, 10)
+        top_materials.index = pd.Index(format_material_ids(top_materials.index), name='Material_ID')
         
         # Top planners by volume handled
-        top_planners = df.groupby('Planner')['Tracking_Count'].sum().nlargest(10)
+        planner_totals = self._reduce(df.groupby('Planner', observed=True, sort=False), 'Tracking_Count', 'sum')
+        top_planners = _top_n(planner_totals, 10)
         
         # Market distribution
-        market_distribution = df.groupby('Market')['Tracking_Count'].sum().sort_values(ascending=False)
+        market_distribution = self._reduce(df.groupby('Market', observed=True), 'Tracking_Count', 'sum').sort_values(ascending=False)
         
         return {
             'top_materials': top_materials,
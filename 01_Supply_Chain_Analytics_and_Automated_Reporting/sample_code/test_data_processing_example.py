@@ -0,0 +1,41 @@
+"""
+Consistency checks for the supply chain analyzer
+
+Run from this directory with: python -m unittest test_data_processing_example
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_processing_example import SupplyChainAnalyzer
+
+
+class TrendMetricsMissingValuesTest(unittest.TestCase):
+    """
+    Daily trend means must skip missing values, as groupby().mean() does
+    """
+
+    def test_daily_means_match_groupby_mean_with_missing_values(self):
+        analyzer = SupplyChainAnalyzer()
+        analyzer.generate_sample_data(2000)
+        data = analyzer.data.astype({'ESD_Planning_Status': object,
+                                     'Supply_Risk_Score': 'float64',
+                                     'Priority_Level': 'float64'})
+        rng = np.random.default_rng(0)
+        for col in ['ESD_Planning_Status', 'Supply_Risk_Score', 'Priority_Level']:
+            data.loc[rng.random(len(data)) < 0.2, col] = np.nan
+        analyzer.data = data
+
+        processed = analyzer.clean_and_process_data()
+        daily_trends = analyzer.calculate_trend_metrics()['daily_trends'].set_index('Date')
+
+        columns = ['Priority_Level', 'Planning_Delay_Days', 'Supply_Risk_Score']
+        expected = processed.groupby('Date')[columns].mean()
+        pd.testing.assert_frame_equal(daily_trends[columns], expected,
+                                      check_dtype=False, check_freq=False, rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
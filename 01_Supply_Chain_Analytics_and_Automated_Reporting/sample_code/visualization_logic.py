@@ -63,7 +63,7 @@ class SupplyChainVisualizer:
         Create market-wise trend analysis (equivalent to "Trend Analysis by Market" tab)
         """
         # Group by market and date
-        market_trends = self.data.groupby(['Date', 'Market'])['Tracking_Count'].sum().reset_index()
+        market_trends = self.data.groupby(['Date', 'Market'], observed=True)['Tracking_Count'].sum().reset_index()
         
         # Create subplot for each market
         markets = self.data['Market'].unique()
@@ -104,7 +104,7 @@ class SupplyChainVisualizer:
         Create planner performance analysis (equivalent to "Current tab for Individual")
         """
         # Calculate planner metrics
-        planner_metrics = self.data.groupby('Planner').agg({
+        planner_metrics = self.data.groupby('Planner', observed=True).agg({
             'Tracking_Count': 'sum',
             'Planning_Delay_Days': 'mean',
             'Supply_Risk_Score': 'mean'
@@ -141,6 +141,9 @@ class SupplyChainVisualizer:
         
         # 4. Top materials treemap simulation (using bar chart)
         top_materials = self.data.groupby('Material_ID')['Tracking_Count'].sum().nlargest(10)
+        if pd.api.types.is_integer_dtype(top_materials.index):
+            from data_processing_example import format_material_ids
+            top_materials.index = pd.Index(format_material_ids(top_materials.index), name='Material_ID')
         top_materials.plot(kind='barh', ax=axes[1,1])
         axes[1,1].set_title('Top 10 Materials by Tracking Count', fontweight='bold')
         axes[1,1].set_xlabel('Tracking Count')
@@ -158,7 +161,7 @@ class SupplyChainVisualizer:
         """
         # Prepare data for interactive charts
         daily_trends = self.data.groupby(['Date', 'Priority_Level'])['Tracking_Count'].sum().reset_index()
-        market_trends = self.data.groupby(['Date', 'Market'])['Tracking_Count'].sum().reset_index()
+        market_trends = self.data.groupby(['Date', 'Market'], observed=True)['Tracking_Count'].sum().reset_index()
         
         # Create subplot figure
         fig = make_subplots(
@@ -1,41 +1,200 @@
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass, fields
 from scipy import stats
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    pl = None
+    POLARS_AVAILABLE = False
+
+# Canonical segment order, also used as the Classification category order
+SEGMENTS = ['Strategic', 'Critical', 'Operational', 'Transactional']
+
+# Columns read by the analyses; Parquet loads project onto just these
+ANALYSIS_COLUMNS = ['Supplier_ID', 'Business_Unit', 'Classification', 'Score', 'Annual_Spend',
+                    'Ramp_Time_Months', 'Partnership_Score', 'Innovation_Score',
+                    'Supply_Risk_Score', 'Sole_Source_Ratio', 'Sole_Source_Parts']
+
+@dataclass(slots=True)
+class AnalysisSummary:
+    """
+    Fixed-layout container for the exported segmentation analysis
+    """
+    analysis_timestamp: pd.Timestamp
+    total_suppliers: int
+    segment_profiles: dict
+    business_unit_analysis: dict
+    risk_analysis: dict
+    spend_analysis: dict
+    innovation_analysis: dict
+    effectiveness_metrics: dict
+    actionable_insights: list
+    
+    def to_dict(self):
+        """
+        Plain dict view, keyed like the original summary dict
+        """
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
 class SegmentationAnalyzer:
     """
     Advanced analytics for supplier segmentation results
     """
     
-    def __init__(self, suppliers_data):
-        self.data = suppliers_data
+    def __init__(self, suppliers_data=None, use_polars=POLARS_AVAILABLE, cache_path=None):
+        # With a cache_path, persist the given data there, or load it when no data is given
+        if suppliers_data is None:
+            if cache_path is None:
+                raise ValueError("No supplier data available. Pass suppliers_data or a cache_path.")
+            suppliers_data = pd.read_parquet(cache_path, columns=ANALYSIS_COLUMNS, engine='pyarrow')
+        elif cache_path is not None:
+            self.save_parquet(suppliers_data, cache_path)
+        
+        # Segment codes must follow SEGMENTS order, whatever categories the input carries
+        classification_dtype = suppliers_data['Classification'].dtype
+        if (not isinstance(classification_dtype, pd.CategoricalDtype)
+                or list(classification_dtype.categories) != SEGMENTS):
+            suppliers_data = suppliers_data.assign(
+                Classification=pd.Categorical(suppliers_data['Classification'], categories=SEGMENTS))
+        
+        # Spend totals are reduced in float64 on the pandas path too, whatever dtype the input uses
+        if suppliers_data['Annual_Spend'].dtype != np.float64:
+            suppliers_data = suppliers_data.astype({'Annual_Spend': 'float64'})
+        
+        # Store rows partitioned by segment so each segment is one contiguous slice
+        self._bu_order = pd.unique(suppliers_data['Business_Unit'])
+        segment_codes = suppliers_data['Classification'].cat.codes.to_numpy()
+        row_order = np.argsort(segment_codes, kind='stable')
+        self.data = suppliers_data.take(row_order).reset_index(drop=True)
+        sorted_codes = segment_codes[row_order]
+        segment_ids = np.arange(len(SEGMENTS))
+        starts = np.searchsorted(sorted_codes, segment_ids, side='left')
+        stops = np.searchsorted(sorted_codes, segment_ids, side='right')
+        self._seg_slices = {segment: slice(start, stop)
+                            for segment, start, stop in zip(SEGMENTS, starts, stops)}
         self.analysis_results = {}
+        
+        # Groupers shared across analyses, so group indices are factorized once
+        self._gb_class = self.data.groupby('Classification', observed=True)
+        self._gb_bu = self.data.groupby('Business_Unit', observed=True)
+        self._gb_bu_class = self.data.groupby(['Business_Unit', 'Classification'], observed=True)
+        
+        # Portfolio-wide figures reused by several analyses
+        self._total_spend = self.data['Annual_Spend'].sum()
+        self._score_mean = self.data['Score'].mean()
+        
+        # Lazy Polars view of the data for the grouped aggregations, when available
+        self._lazy = pl.from_pandas(self.data).lazy() if use_polars else None
+        self._polars_aggregates = None
+    
+    def _segment_counts(self, mask):
+        """
+        Count rows matching a boolean mask within each segment's contiguous slice
+        """
+        counts = {segment: int(np.count_nonzero(mask[rows])) for segment, rows in self._seg_slices.items()}
+        return {segment: count for segment, count in counts.items() if count > 0}
+    
+    @staticmethod
+    def save_parquet(suppliers_data, path):
+        """
+        Persist classified supplier data as zstd-compressed, dictionary-encoded Parquet
+        """
+        suppliers_data.to_parquet(path, engine='pyarrow', index=False, compression='zstd',
+                                  use_dictionary=True, row_group_size=64_000)
+    
+    def _collect_polars_aggregates(self):
+        """
+        Build the grouped aggregations shared by the profile and business unit
+        analyses as lazy queries and collect them together in one Polars run
+        """
+        if self._polars_aggregates is None:
+            # Spend is always reduced in float64, as on the pandas path
+            spend = pl.col('Annual_Spend').cast(pl.Float64)
+            # Per-segment queries skip unclassified rows, as the observed=True pandas groupers do
+            classified = self._lazy.filter(pl.col('Classification').is_not_null())
+            queries = {
+                'segment_profiles': classified.group_by('Classification').agg(
+                    pl.len().alias('count'),
+                    pl.col('Score').mean().alias('avg_score'),
+                    spend.mean().alias('avg_spend'),
+                    pl.col('Ramp_Time_Months').mean().alias('avg_ramp_time'),
+                    pl.col('Partnership_Score').mean().alias('avg_partnership'),
+                    pl.col('Innovation_Score').mean().alias('avg_innovation'),
+                    pl.col('Supply_Risk_Score').mean().alias('avg_risk'),
+                    pl.col('Sole_Source_Ratio').mean().alias('sole_source_ratio'),
+                    spend.sum().alias('spend_concentration')
+                ),
+                'bu_totals': self._lazy.group_by('Business_Unit', maintain_order=True).agg(
+                    pl.len().alias('total_suppliers'),
+                    spend.sum().alias('total_spend'),
+                    pl.col('Score').mean().alias('avg_score'),
+                    spend.filter(pl.col('Classification') == 'Strategic')
+                      .sum().alias('strategic_spend')
+                ),
+                'bu_segment_counts': classified.group_by(['Business_Unit', 'Classification'])
+                                               .agg(pl.len().alias('count'))
+            }
+            collected = pl.collect_all(list(queries.values()))
+            self._polars_aggregates = dict(zip(queries, collected))
+        return self._polars_aggregates
+    
+    def _segment_profile_table(self):
+        """
+        Per-segment profile metrics indexed by Classification
+        """
+        if self._lazy is not None:
+            table = self._collect_polars_aggregates()['segment_profiles']
+            return table.to_pandas().set_index('Classification')
+        
+        return self._gb_class.agg(
+            count=('Score', 'size'),
+            avg_score=('Score', 'mean'),
+            avg_spend=('Annual_Spend', 'mean'),
+            avg_ramp_time=('Ramp_Time_Months', 'mean'),
+            avg_partnership=('Partnership_Score', 'mean'),
+            avg_innovation=('Innovation_Score', 'mean'),
+            avg_risk=('Supply_Risk_Score', 'mean'),
+            sole_source_ratio=('Sole_Source_Ratio', 'mean'),
+            spend_concentration=('Annual_Spend', 'sum')
+        )
+    
+    def _business_unit_tables(self):
+        """
+        Per-BU totals (in first-appearance order) and supplier counts per (BU, segment)
+        """
+        if self._lazy is not None:
+            aggregates = self._collect_polars_aggregates()
+            bu_totals = aggregates['bu_totals'].to_pandas().set_index('Business_Unit')
+            segment_counts = (aggregates['bu_segment_counts'].to_pandas()
+                              .set_index(['Business_Unit', 'Classification'])['count'])
+            return bu_totals.reindex(self._bu_order), segment_counts
+        
+        segment_spend = self._gb_bu_class['Annual_Spend'].sum()
+        bu_totals = self._gb_bu.agg(
+            total_suppliers=('Score', 'size'),
+            total_spend=('Annual_Spend', 'sum'),
+            avg_score=('Score', 'mean')
+        )
+        strategic_spend = segment_spend[segment_spend.index.get_level_values('Classification') == 'Strategic']
+        bu_totals['strategic_spend'] = (strategic_spend.droplevel('Classification')
+                                        .reindex(bu_totals.index, fill_value=0))
+        segment_counts = self._gb_bu_class.size()
+        return bu_totals.reindex(self._bu_order), segment_counts
     
     def segment_profile_analysis(self):
         """
         Analyze characteristics of each supplier segment
         """
-        segments = ['Strategic', 'Critical', 'Operational', 'Transactional']
-        profiles = {}
-        
-        for segment in segments:
-            segment_data = self.data[self.data['Classification'] == segment]
-            
-            if len(segment_data) > 0:
-                profile = {
-                    'count': len(segment_data),
-                    'avg_score': segment_data['Score'].mean(),
-                    'avg_spend': segment_data['Annual_Spend'].mean(),
-                    'avg_ramp_time': segment_data['Ramp_Time_Months'].mean(),
-                    'avg_partnership': segment_data['Partnership_Score'].mean(),
-                    'avg_innovation': segment_data['Innovation_Score'].mean(),
-                    'avg_risk': segment_data['Supply_Risk_Score'].mean(),
-                    'sole_source_ratio': segment_data['Sole_Source_Ratio'].mean(),
-                    'spend_concentration': segment_data['Annual_Spend'].sum() / self.data['Annual_Spend'].sum()
-                }
-                profiles[segment] = profile
+        # All per-segment metrics in a single grouped pass
+        grouped = self._segment_profile_table()
+        grouped['spend_concentration'] /= self._total_spend
+        grouped = grouped.reindex([segment for segment in SEGMENTS if segment in grouped.index])
+        profiles = grouped.to_dict(orient='index')
         
         self.analysis_results['segment_profiles'] = profiles
         return profiles
@@ -45,21 +204,20 @@ class SegmentationAnalyzer:
         Analyze segmentation patterns by business unit
         """
         bu_analysis = {}
-        business_units = self.data['Business_Unit'].unique()
+        bu_totals, segment_counts = self._business_unit_tables()
         
-        for bu in business_units:
-            bu_data = self.data[self.data['Business_Unit'] == bu]
-            
-            # Segment distribution
-            segment_dist = bu_data['Classification'].value_counts(normalize=True) * 100
+        for bu, totals in bu_totals.iterrows():
+            # Segment distribution over the BU's classified suppliers, as value_counts(normalize=True) gives
+            bu_counts = segment_counts.loc[bu]
+            segment_dist = bu_counts.sort_values(ascending=False) / bu_counts.sum() * 100
             
             # Key metrics
             metrics = {
-                'total_suppliers': len(bu_data),
-                'total_spend': bu_data['Annual_Spend'].sum(),
-                'avg_score': bu_data['Score'].mean(),
+                'total_suppliers': int(totals['total_suppliers']),
+                'total_spend': totals['total_spend'],
+                'avg_score': totals['avg_score'],
                 'segment_distribution': segment_dist.to_dict(),
-                'strategic_spend_share': bu_data[bu_data['Classification'] == 'Strategic']['Annual_Spend'].sum() / bu_data['Annual_Spend'].sum() * 100
+                'strategic_spend_share': totals['strategic_spend'] / totals['total_spend'] * 100
             }
             
             bu_analysis[bu] = metrics
@@ -72,17 +230,18 @@ class SegmentationAnalyzer:
         Analyze supply risk concentration across segments
         """
         # High risk suppliers (risk score = 3)
-        high_risk = self.data[self.data['Supply_Risk_Score'] == 3]
+        high_risk = self.data['Supply_Risk_Score'].to_numpy() == 3
+        high_risk_by_segment = self._segment_counts(high_risk)
         
         # Sole source dependency analysis
-        sole_source = self.data[self.data['Sole_Source_Parts'] > 0]
+        sole_source = self.data['Sole_Source_Parts'].to_numpy() > 0
         
         risk_analysis = {
-            'high_risk_by_segment': high_risk.groupby('Classification').size().to_dict(),
-            'sole_source_by_segment': sole_source.groupby('Classification').size().to_dict(),
-            'critical_risk_suppliers': len(high_risk[high_risk['Classification'].isin(['Strategic', 'Critical'])]),
-            'high_spend_high_risk': len(self.data[(self.data['Supply_Risk_Score'] == 3) & 
-                                                 (self.data['Annual_Spend'] > self.data['Annual_Spend'].quantile(0.8))])
+            'high_risk_by_segment': high_risk_by_segment,
+            'sole_source_by_segment': self._segment_counts(sole_source),
+            'critical_risk_suppliers': sum(high_risk_by_segment.get(segment, 0) for segment in ['Strategic', 'Critical']),
+            'high_spend_high_risk': int(np.count_nonzero(
+                high_risk & (self.data['Annual_Spend'].to_numpy() > self.data['Annual_Spend'].quantile(0.8))))
         }
         
         self.analysis_results['risk_analysis'] = risk_analysis
@@ -92,18 +251,18 @@ class SegmentationAnalyzer:
         """
         Analyze spend concentration patterns
         """
-        # Pareto analysis
-        sorted_suppliers = self.data.sort_values('Annual_Spend', ascending=False)
-        sorted_suppliers['cumulative_spend'] = sorted_suppliers['Annual_Spend'].cumsum()
-        total_spend = sorted_suppliers['Annual_Spend'].sum()
-        sorted_suppliers['cumulative_spend_pct'] = sorted_suppliers['cumulative_spend'] / total_spend * 100
+        # Pareto analysis on the descending spend curve
+        sorted_spend = np.sort(self.data['Annual_Spend'].to_numpy())[::-1]
+        cumulative_spend = np.cumsum(sorted_spend)
+        total_spend = self._total_spend
+        cumulative_spend_pct = cumulative_spend / total_spend * 100
         
-        # Find 80/20 breakpoint
-        pareto_80_index = (sorted_suppliers['cumulative_spend_pct'] <= 80).sum()
-        pareto_80_pct = pareto_80_index / len(sorted_suppliers) * 100
+        # Find 80/20 breakpoint (number of suppliers within the first 80% of spend)
+        pareto_80_index = int(np.searchsorted(cumulative_spend_pct, 80, side='right'))
+        pareto_80_pct = pareto_80_index / len(sorted_spend) * 100
         
         # Segment spend analysis
-        segment_spend = self.data.groupby('Classification')['Annual_Spend'].agg(['sum', 'count'])
+        segment_spend = self._gb_class['Annual_Spend'].agg(['sum', 'count'])
         segment_spend['avg_spend'] = segment_spend['sum'] / segment_spend['count']
         segment_spend['spend_share'] = segment_spend['sum'] / total_spend * 100
         
@@ -111,7 +270,7 @@ class SegmentationAnalyzer:
             'pareto_80_suppliers_pct': pareto_80_pct,
             'pareto_80_supplier_count': pareto_80_index,
             'segment_spend_analysis': segment_spend.to_dict(),
-            'top_10_suppliers_spend_share': sorted_suppliers.head(10)['Annual_Spend'].sum() / total_spend * 100
+            'top_10_suppliers_spend_share': cumulative_spend[min(10, len(cumulative_spend)) - 1] / total_spend * 100
         }
         
         self.analysis_results['spend_analysis'] = spend_analysis
@@ -122,13 +281,19 @@ class SegmentationAnalyzer:
         Analyze innovation potential across segments
         """
         # High innovation suppliers
-        high_innovation = self.data[self.data['Innovation_Score'] == 3]
+        high_innovation_by_segment = self._segment_counts(self.data['Innovation_Score'].to_numpy() == 3)
+        
+        # Pearson correlation of innovation with log spend, on raw arrays
+        spend = self.data['Annual_Spend'].to_numpy(dtype=np.float64)
+        innovation = self.data['Innovation_Score'].to_numpy(dtype=np.float64)
+        valid = (spend > 0) & ~np.isnan(innovation)
+        innovation_spend_corr = float(np.corrcoef(innovation[valid], np.log(spend[valid]))[0, 1])
         
         innovation_analysis = {
-            'high_innovation_by_segment': high_innovation.groupby('Classification').size().to_dict(),
-            'innovation_spend_correlation': self.data['Innovation_Score'].corr(np.log(self.data['Annual_Spend'])),
-            'strategic_innovation_suppliers': len(high_innovation[high_innovation['Classification'] == 'Strategic']),
-            'untapped_innovation_potential': len(high_innovation[high_innovation['Classification'] == 'Transactional'])
+            'high_innovation_by_segment': high_innovation_by_segment,
+            'innovation_spend_correlation': innovation_spend_corr,
+            'strategic_innovation_suppliers': high_innovation_by_segment.get('Strategic', 0),
+            'untapped_innovation_potential': high_innovation_by_segment.get('Transactional', 0)
         }
         
         self.analysis_results['innovation_analysis'] = innovation_analysis
@@ -138,18 +303,21 @@ class SegmentationAnalyzer:
         """
         Calculate metrics to assess segmentation effectiveness
         """
+        segment_score_groups = self._gb_class['Score']
+        
         # Score separation between segments
-        segment_scores = self.data.groupby('Classification')['Score'].mean()
+        segment_scores = segment_score_groups.mean()
         score_separation = segment_scores.max() - segment_scores.min()
         
         # Within-segment variance
-        segment_variance = self.data.groupby('Classification')['Score'].var().mean()
+        segment_variance = segment_score_groups.var().mean()
         
         # Silhouette-like analysis for segmentation quality
         total_variance = self.data['Score'].var()
-        between_segment_variance = self.data.groupby('Classification')['Score'].apply(
-            lambda x: len(x) * (x.mean() - self.data['Score'].mean()) ** 2
-        ).sum() / len(self.data)
+        segment_sizes = segment_score_groups.size()
+        between_segment_variance = (
+            ((segment_scores - self._score_mean) ** 2 * segment_sizes).sum() / len(self.data)
+        )
         
         effectiveness_metrics = {
             'score_separation': score_separation,
@@ -213,17 +381,17 @@ class SegmentationAnalyzer:
         """
         Export comprehensive analysis summary
         """
-        summary = {
-            'analysis_timestamp': pd.Timestamp.now(),
-            'total_suppliers': len(self.data),
-            'segment_profiles': self.analysis_results.get('segment_profiles', {}),
-            'business_unit_analysis': self.analysis_results.get('business_unit_analysis', {}),
-            'risk_analysis': self.analysis_results.get('risk_analysis', {}),
-            'spend_analysis': self.analysis_results.get('spend_analysis', {}),
-            'innovation_analysis': self.analysis_results.get('innovation_analysis', {}),
-            'effectiveness_metrics': self.analysis_results.get('effectiveness_metrics', {}),
-            'actionable_insights': self.generate_actionable_insights()
-        }
+        summary = AnalysisSummary(
+            analysis_timestamp=pd.Timestamp.now(),
+            total_suppliers=len(self.data),
+            segment_profiles=self.analysis_results.get('segment_profiles', {}),
+            business_unit_analysis=self.analysis_results.get('business_unit_analysis', {}),
+            risk_analysis=self.analysis_results.get('risk_analysis', {}),
+            spend_analysis=self.analysis_results.get('spend_analysis', {}),
+            innovation_analysis=self.analysis_results.get('innovation_analysis', {}),
+            effectiveness_metrics=self.analysis_results.get('effectiveness_metrics', {}),
+            actionable_insights=self.generate_actionable_insights()
+        )
         
         return summary
 
@@ -6,12 +6,71 @@ from typing import Dict, List, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _score_numpy(bu_idx, sole_r, single_r, multi_r, ramp, spend, part, innov, risk, W):
+    """
+    Supplier scores as whole-array NumPy expressions, one weight row per supplier
+    """
+    w = W[bu_idx].T
+    
+    # BU Impact factor (simplified as constant for this example)
+    bu_impact = w[0] / 100
+    bu_scale = 1.0  # Normalized scale factor
+    
+    # Part sourcing components
+    sourcing_component = (w[1] * sole_r + w[2] * single_r + w[3] * multi_r) / 100
+    
+    # Ramp time, spend, partnership, innovation and (inverted) supply risk components
+    ramp_component = w[4] * (1 - 1 / (1 + (ramp / 12) ** 2)) / 100
+    spend_component = w[5] * (1 - 1 / (1 + spend / 100)) / 100
+    partnership_component = w[6] * (part / 3) / 100
+    innovation_component = w[7] * (innov / 3) / 100
+    risk_component = w[8] * ((4 - risk) / 3) / 100
+    
+    # Total score, accumulated in place in the sourcing buffer rather than a new array per operation
+    total_score = sourcing_component
+    for component in (ramp_component, spend_component, partnership_component,
+                      innovation_component, risk_component):
+        total_score += component
+    total_score *= bu_impact * bu_scale
+    
+    total_score *= 100  # Scale to 0-100 range
+    return total_score
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _score_numba(bu_idx, sole_r, single_r, multi_r, ramp, spend, part, innov, risk, W):
+        """
+        Supplier scores with every component fused into one parallel pass over the columns
+        """
+        n = bu_idx.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            w = W[bu_idx[i]]
+            out[i] = 100 * (w[0] / 100) * (
+                (w[1] * sole_r[i] + w[2] * single_r[i] + w[3] * multi_r[i]) / 100 +
+                w[4] * (1 - 1 / (1 + (ramp[i] / 12) ** 2)) / 100 +
+                w[5] * (1 - 1 / (1 + spend[i] / 100)) / 100 +
+                w[6] * (part[i] / 3) / 100 +
+                w[7] * (innov[i] / 3) / 100 +
+                w[8] * ((4 - risk[i]) / 3) / 100
+            )
+        return out
+
 class SupplierScoringModel:
     """
     Implementation of the strategic supplier classification scoring algorithm
     """
     
-    def __init__(self):
+    def __init__(self, use_numba=False):
+        if use_numba and not NUMBA_AVAILABLE:
+            raise ImportError("use_numba=True requires numba to be installed.")
+        self.use_numba = use_numba
         self.suppliers_data = None
         self.scores = None
         self.classifications = None
@@ -42,6 +101,18 @@ class SupplierScoringModel:
             }
         }
         
+        # The same weights as a (business unit, weight) matrix, gathered by integer
+        # business unit code in calculate_scores
+        self._weight_keys = ['W0', 'W2', 'W3', 'W4', 'W5', 'W6', 'W7', 'W8', 'W9']
+        self._bu_index = {bu: idx for idx, bu in enumerate(self.bu_weights)}
+        self._score_columns = ['Sole_Source_Ratio', 'Single_Source_Ratio', 'Multi_Source_Ratio',
+                               'Ramp_Time_Months', 'Annual_Spend', 'Partnership_Score',
+                               'Innovation_Score', 'Supply_Risk_Score']
+        self._weight_matrix = np.array(
+            [[weights[key] for key in self._weight_keys] for weights in self.bu_weights.values()],
+            dtype=np.float64
+        )
+        
         # Segmentation thresholds (percentiles)
         self.segmentation_thresholds = {
             'Strategic': 95,     # Top 5%
@@ -49,6 +120,33 @@ class SupplierScoringModel:
             'Operational': 45,   # Next 40% (45-85%)
             'Transactional': 0   # Bottom 40% (0-45%)
         }
+        
+        # Narrowest safe dtypes for the supplier columns; labels become categoricals
+        # so groupby and comparisons work on integer codes
+        self.supplier_dtypes = {
+            'Supplier_ID': 'category',
+            'Business_Unit': 'category',
+            'Annual_Spend': 'float64',  # Money keeps full precision
+            'Sole_Source_Parts': 'int16',
+            'Single_Source_Parts': 'int16',
+            'Multi_Source_Parts': 'int16',
+            'Ramp_Time_Months': 'int16',
+            'Partnership_Score': 'int8',
+            'Innovation_Score': 'int8',
+            'Supply_Risk_Score': 'int8',
+            'Sole_Source_Ratio': 'float32',
+            'Single_Source_Ratio': 'float32',
+            'Multi_Source_Ratio': 'float32'
+        }
+        
+        if use_numba:
+            # Compile the scoring kernel up front so the first classification doesn't pay for it;
+            # numba types read-only views and writable copies differently, so the dummy row
+            # uses the same dtypes as the sample data
+            self.calculate_scores(pd.DataFrame({
+                'Business_Unit': list(self.bu_weights)[:1],
+                **{name: [0] for name in self._score_columns}
+            }).astype({name: self.supplier_dtypes[name] for name in ['Business_Unit', *self._score_columns]}))
     
     def generate_sample_supplier_data(self, n_suppliers=1000):
         """
@@ -59,41 +157,43 @@ class SupplierScoringModel:
         business_units = ['Business_Unit_A', 'Business_Unit_B']
         bu_weights = [0.75, 0.25]  # Approximate distribution
         
-        suppliers = []
-        
-        for i in range(n_suppliers):
-            supplier_id = f"SUP_{i+1:04d}"
-            business_unit = np.random.choice(business_units, p=bu_weights)
-            
-            # Generate supplier characteristics
-            supplier = {
-                'Supplier_ID': supplier_id,
-                'Business_Unit': business_unit,
-                'Annual_Spend': np.random.lognormal(mean=12, sigma=1.5),  # Spend in thousands
-                'Sole_Source_Parts': np.random.poisson(2),
-                'Single_Source_Parts': np.random.poisson(5),
-                'Multi_Source_Parts': np.random.poisson(15),
-                'Ramp_Time_Months': np.random.choice([3, 6, 9, 12, 18, 24], 
-                                                   p=[0.1, 0.3, 0.25, 0.2, 0.1, 0.05]),
-                'Partnership_Score': np.random.choice([1, 2, 3], p=[0.2, 0.6, 0.2]),  # 1=Poor, 2=Good, 3=Excellent
-                'Innovation_Score': np.random.choice([1, 2, 3], p=[0.3, 0.5, 0.2]),   # 1=Low, 2=Medium, 3=High
-                'Supply_Risk_Score': np.random.choice([1, 2, 3], p=[0.4, 0.4, 0.2])   # 1=Low, 2=Medium, 3=High
-            }
-            
-            # Calculate derived metrics
-            total_parts = supplier['Sole_Source_Parts'] + supplier['Single_Source_Parts'] + supplier['Multi_Source_Parts']
-            supplier['Sole_Source_Ratio'] = supplier['Sole_Source_Parts'] / max(total_parts, 1)
-            supplier['Single_Source_Ratio'] = supplier['Single_Source_Parts'] / max(total_parts, 1)
-            supplier['Multi_Source_Ratio'] = supplier['Multi_Source_Parts'] / max(total_parts, 1)
-            
-            suppliers.append(supplier)
-        
-        self.suppliers_data = pd.DataFrame(suppliers)
+        # Draw each supplier characteristic for all suppliers in one vectorized call
+        n = n_suppliers
+        sole_source_parts = np.random.poisson(2, size=n)
+        single_source_parts = np.random.poisson(5, size=n)
+        multi_source_parts = np.random.poisson(15, size=n)
+        
+        # Calculate derived metrics
+        total_parts = np.maximum(sole_source_parts + single_source_parts + multi_source_parts, 1)
+        
+        # Label columns are built straight from integer codes, so no per-cell strings are hashed
+        bu_codes = np.random.choice(len(business_units), size=n, p=bu_weights)
+        
+        self.suppliers_data = pd.DataFrame({
+            'Supplier_ID': pd.Categorical.from_codes(np.arange(n), categories=[f"SUP_{i+1:04d}" for i in range(n)]),
+            'Business_Unit': pd.Categorical.from_codes(bu_codes, categories=business_units),
+            'Annual_Spend': np.random.lognormal(mean=12, sigma=1.5, size=n),  # Spend in thousands
+            'Sole_Source_Parts': sole_source_parts,
+            'Single_Source_Parts': single_source_parts,
+            'Multi_Source_Parts': multi_source_parts,
+            'Ramp_Time_Months': np.random.choice([3, 6, 9, 12, 18, 24], size=n,
+                                                 p=[0.1, 0.3, 0.25, 0.2, 0.1, 0.05]),
+            'Partnership_Score': np.random.choice([1, 2, 3], size=n, p=[0.2, 0.6, 0.2]),  # 1=Poor, 2=Good, 3=Excellent
+            'Innovation_Score': np.random.choice([1, 2, 3], size=n, p=[0.3, 0.5, 0.2]),   # 1=Low, 2=Medium, 3=High
+            'Supply_Risk_Score': np.random.choice([1, 2, 3], size=n, p=[0.4, 0.4, 0.2]),  # 1=Low, 2=Medium, 3=High
+            'Sole_Source_Ratio': sole_source_parts / total_parts,
+            'Single_Source_Ratio': single_source_parts / total_parts,
+            'Multi_Source_Ratio': multi_source_parts / total_parts
+        }).astype(self.supplier_dtypes)  # Downcast after the ratios are computed at full precision
         return self.suppliers_data
     
     def calculate_supplier_score(self, supplier_row, business_unit):
         """
         Calculate supplier score using the weighted algorithm
+        
+        Fields are read by attribute, so supplier_row can be a namedtuple from
+        itertuples(index=False) as well as a Series; prefer calculate_scores for
+        whole DataFrames.
         """
         weights = self.bu_weights[business_unit]
         
@@ -103,25 +203,25 @@ class SupplierScoringModel:
         
         # Part sourcing components
         sourcing_component = (
-            weights['W2'] * supplier_row['Sole_Source_Ratio'] +
-            weights['W3'] * supplier_row['Single_Source_Ratio'] + 
-            weights['W4'] * supplier_row['Multi_Source_Ratio']
+            weights['W2'] * supplier_row.Sole_Source_Ratio +
+            weights['W3'] * supplier_row.Single_Source_Ratio + 
+            weights['W4'] * supplier_row.Multi_Source_Ratio
         ) / 100
         
         # Ramp time component (normalized)
-        ramp_component = weights['W5'] * (1 - 1 / (1 + (supplier_row['Ramp_Time_Months'] / 12) ** 2)) / 100
+        ramp_component = weights['W5'] * (1 - 1 / (1 + (supplier_row.Ramp_Time_Months / 12) ** 2)) / 100
         
         # Spend component (normalized)
-        spend_component = weights['W6'] * (1 - 1 / (1 + supplier_row['Annual_Spend'] / 100)) / 100
+        spend_component = weights['W6'] * (1 - 1 / (1 + supplier_row.Annual_Spend / 100)) / 100
         
         # Partnership component
-        partnership_component = weights['W7'] * (supplier_row['Partnership_Score'] / 3) / 100
+        partnership_component = weights['W7'] * (supplier_row.Partnership_Score / 3) / 100
         
         # Innovation component  
-        innovation_component = weights['W8'] * (supplier_row['Innovation_Score'] / 3) / 100
+        innovation_component = weights['W8'] * (supplier_row.Innovation_Score / 3) / 100
         
         # Supply risk component (inverted - lower risk = higher score)
-        risk_component = weights['W9'] * ((4 - supplier_row['Supply_Risk_Score']) / 3) / 100
+        risk_component = weights['W9'] * ((4 - supplier_row.Supply_Risk_Score) / 3) / 100
         
         # Total score calculation
         total_score = bu_impact * bu_scale * (
@@ -131,6 +231,22 @@ class SupplierScoringModel:
         
         return total_score * 100  # Scale to 0-100 range
     
+    def calculate_scores(self, suppliers):
+        """
+        Vectorized form of calculate_supplier_score over a whole DataFrame of suppliers
+        """
+        # Encode each supplier's business unit once as a row of the weight matrix
+        bu_idx = suppliers['Business_Unit'].map(self._bu_index)
+        if bu_idx.isna().any():
+            raise ValueError("Unknown business unit found in supplier data.")
+        
+        score = _score_numba if self.use_numba else _score_numpy
+        return score(
+            bu_idx.to_numpy(dtype=np.intp),
+            *(suppliers[name].to_numpy(dtype=np.float64) for name in self._score_columns),
+            self._weight_matrix
+        )
+    
     def classify_suppliers(self):
         """
         Calculate scores and classify all suppliers
@@ -138,31 +254,26 @@ class SupplierScoringModel:
         if self.suppliers_data is None:
             raise ValueError("No supplier data available. Please generate or load data first.")
         
-        # Calculate scores for each supplier
-        scores = []
-        for idx, supplier in self.suppliers_data.iterrows():
-            score = self.calculate_supplier_score(supplier, supplier['Business_Unit'])
-            scores.append(score)
+        # Calculate scores for all suppliers in one vectorized pass
+        scores = self.calculate_scores(self.suppliers_data)
         
         self.suppliers_data['Score'] = scores
         
-        # Classify suppliers based on score percentiles
-        classifications = []
-        for score in scores:
-            percentile = (self.suppliers_data['Score'] <= score).mean() * 100
-            
-            if percentile >= self.segmentation_thresholds['Strategic']:
-                classification = 'Strategic'
-            elif percentile >= self.segmentation_thresholds['Critical']:
-                classification = 'Critical'
-            elif percentile >= self.segmentation_thresholds['Operational']:
-                classification = 'Operational'
-            else:
-                classification = 'Transactional'
-            
-            classifications.append(classification)
-        
-        self.suppliers_data['Classification'] = classifications
+        # Classify suppliers based on score percentiles: the share of suppliers
+        # scoring at or below each supplier, found by binary search on the sorted scores
+        sorted_scores = np.sort(scores)
+        percentiles = np.searchsorted(sorted_scores, scores, side='right') / len(scores) * 100
+        
+        thresholds = self.segmentation_thresholds
+        classifications = np.select(
+            [percentiles >= thresholds['Strategic'],
+             percentiles >= thresholds['Critical'],
+             percentiles >= thresholds['Operational']],
+            ['Strategic', 'Critical', 'Operational'],
+            default='Transactional'
+        )
+        
+        self.suppliers_data['Classification'] = pd.Categorical(classifications)
         return self.suppliers_data
     
     def analyze_segmentation_results(self):
@@ -191,28 +302,43 @@ class SupplierScoringModel:
         bu_breakdown = self.suppliers_data.groupby(['Business_Unit', 'Classification']).size().unstack(fill_value=0)
         print(bu_breakdown)
         
-        # Score statistics
+        # Score statistics, summarized in one pass and reused for the printout
+        score_stats = self.suppliers_data['Score'].describe()
         print(f"\nScore Statistics:")
         print("=" * 20)
-        print(f"Mean Score: {self.suppliers_data['Score'].mean():.2f}")
-        print(f"Std Dev:    {self.suppliers_data['Score'].std():.2f}")
-        print(f"Min Score:  {self.suppliers_data['Score'].min():.2f}")
-        print(f"Max Score:  {self.suppliers_data['Score'].max():.2f}")
+        print(f"Mean Score: {score_stats['mean']:.2f}")
+        print(f"Std Dev:    {score_stats['std']:.2f}")
+        print(f"Min Score:  {score_stats['min']:.2f}")
+        print(f"Max Score:  {score_stats['max']:.2f}")
         
         return {
             'overall_distribution': overall_dist,
             'bu_breakdown': bu_breakdown,
-            'score_stats': self.suppliers_data['Score'].describe()
+            'score_stats': score_stats
         }
     
     def identify_top_suppliers(self, n_top=20):
         """
         Identify top suppliers by classification and score
         """
-        top_suppliers = self.suppliers_data.nlargest(n_top, 'Score')[
+        # Select the candidates with np.partition instead of a full sort, keeping every tie at
+        # the cutoff so the stable sort below breaks ties in row order, as nlargest does
+        scores = self.suppliers_data['Score'].to_numpy()
+        candidates = np.arange(len(scores))
+        if len(scores) > n_top:
+            cutoff = np.partition(scores, len(scores) - n_top)[len(scores) - n_top]
+            candidates = np.flatnonzero(scores >= cutoff)
+        top_idx = candidates[np.argsort(-scores[candidates], kind='stable')[:n_top]]
+        
+        top_suppliers = self.suppliers_data.iloc[top_idx][
             ['Supplier_ID', 'Business_Unit', 'Classification', 'Score', 'Annual_Spend', 
              'Partnership_Score', 'Innovation_Score', 'Supply_Risk_Score']
-        ].round(2)
+        ]
+        # Round just the float columns
+        top_suppliers = top_suppliers.assign(
+            Score=top_suppliers['Score'].round(2),
+            Annual_Spend=top_suppliers['Annual_Spend'].round(2)
+        )
         
         print(f"\nTop {n_top} Suppliers by Score:")
         print("=" * 50)
@@ -224,15 +350,17 @@ class SupplierScoringModel:
         """
         Analyze what drives different classifications
         """
-        classification_analysis = self.suppliers_data.groupby('Classification').agg({
-            'Score': ['mean', 'std'],
-            'Annual_Spend': 'mean',
-            'Ramp_Time_Months': 'mean',
-            'Partnership_Score': 'mean',
-            'Innovation_Score': 'mean',
-            'Supply_Risk_Score': 'mean',
-            'Sole_Source_Ratio': 'mean'
-        }).round(2)
+        grouped = self.suppliers_data.groupby('Classification', observed=True)
+        driver_columns = ['Annual_Spend', 'Ramp_Time_Months', 'Partnership_Score',
+                          'Innovation_Score', 'Supply_Risk_Score', 'Sole_Source_Ratio']
+        
+        # Score mean/std plus a single mean over all driver columns, labelled as (column, stat)
+        score_stats = grouped['Score'].agg(['mean', 'std'])
+        score_stats.columns = pd.MultiIndex.from_product([['Score'], score_stats.columns])
+        driver_means = grouped[driver_columns].mean()
+        driver_means.columns = pd.MultiIndex.from_product([driver_columns, ['mean']])
+        
+        classification_analysis = pd.concat([score_stats, driver_means], axis=1).round(2)
         
         print("\nClassification Driver Analysis:")
         print("=" * 40)
@@ -240,7 +368,7 @@ class SupplierScoringModel:
         
         return classification_analysis
     
-    def create_segmentation_visualization(self):
+    def create_segmentation_visualization(self, show=True):
         """
         Create visualizations of segmentation results
         """
@@ -253,10 +381,13 @@ class SupplierScoringModel:
                      autopct='%1.1f%%', colors=colors, startangle=90)
         axes[0,0].set_title('Supplier Classification Distribution', fontweight='bold')
         
+        # Split the suppliers by classification once for the per-segment panels
+        segment_frames = dict(list(self.suppliers_data.groupby('Classification')))
+        
         # 2. Score distribution by classification
         for classification in ['Strategic', 'Critical', 'Operational', 'Transactional']:
-            subset = self.suppliers_data[self.suppliers_data['Classification'] == classification]
-            if not subset.empty:
+            subset = segment_frames.get(classification)
+            if subset is not None:
                 axes[0,1].hist(subset['Score'], alpha=0.6, label=classification, bins=20)
         axes[0,1].set_xlabel('Score')
         axes[0,1].set_ylabel('Frequency')
@@ -276,8 +407,8 @@ class SupplierScoringModel:
         scatter_colors = {'Strategic': 'gold', 'Critical': 'lightcoral', 
                          'Operational': 'lightblue', 'Transactional': 'lightgreen'}
         for classification in scatter_colors:
-            subset = self.suppliers_data[self.suppliers_data['Classification'] == classification]
-            if not subset.empty:
+            subset = segment_frames.get(classification)
+            if subset is not None:
                 axes[1,1].scatter(subset['Annual_Spend'], subset['Score'], 
                                 c=scatter_colors[classification], label=classification, alpha=0.6)
         axes[1,1].set_xlabel('Annual Spend (thousands)')
@@ -287,7 +418,10 @@ class SupplierScoringModel:
         axes[1,1].set_xscale('log')
         
         plt.tight_layout()
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)  # The returned figure stays usable, but pyplot no longer keeps it open
         
         return fig
 
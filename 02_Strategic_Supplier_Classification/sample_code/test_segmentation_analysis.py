@@ -0,0 +1,57 @@
+"""
+Consistency checks for the segmentation analyzer backends
+
+Run from this directory with: python -m unittest test_segmentation_analysis
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from segmentation_analysis import POLARS_AVAILABLE, SegmentationAnalyzer
+from supplier_scoring_model import SupplierScoringModel
+
+
+@unittest.skipUnless(POLARS_AVAILABLE, "polars is not installed")
+class BackendMissingClassificationTest(unittest.TestCase):
+    """
+    The Polars and pandas backends must agree when some suppliers are unclassified
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        model = SupplierScoringModel()
+        model.generate_sample_supplier_data(1000)
+        data = model.classify_suppliers().astype({'Classification': object})
+        rng = np.random.default_rng(0)
+        data.loc[rng.random(len(data)) < 0.1, 'Classification'] = np.nan
+        cls.polars = SegmentationAnalyzer(data, use_polars=True)
+        cls.pandas = SegmentationAnalyzer(data, use_polars=False)
+
+    def assert_nested_close(self, actual, expected):
+        self.assertEqual(actual.keys(), expected.keys())
+        for key, metrics in expected.items():
+            pd.testing.assert_series_equal(pd.Series(actual[key], dtype=float).sort_index(),
+                                           pd.Series(metrics, dtype=float).sort_index(),
+                                           check_names=False)
+
+    def test_segment_profiles_match(self):
+        self.assert_nested_close(self.polars.segment_profile_analysis(),
+                                 self.pandas.segment_profile_analysis())
+
+    def test_business_unit_segment_distribution_match(self):
+        polars_bu = self.polars.business_unit_analysis()
+        pandas_bu = self.pandas.business_unit_analysis()
+        self.assertEqual(polars_bu.keys(), pandas_bu.keys())
+        for bu, metrics in pandas_bu.items():
+            self.assertTrue(all(pd.notna(segment) for segment in polars_bu[bu]['segment_distribution']))
+            self.assert_nested_close({'share': polars_bu[bu]['segment_distribution']},
+                                     {'share': metrics['segment_distribution']})
+            self.assertEqual(polars_bu[bu]['total_suppliers'], metrics['total_suppliers'])
+            self.assertAlmostEqual(polars_bu[bu]['strategic_spend_share'],
+                                   metrics['strategic_spend_share'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,6 +12,17 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("Set2")
 
+def finish_figure(fig, save_path=None, show=True):
+    """
+    Save a finished matplotlib figure if asked, then show it, or close it for batch callers
+    """
+    if save_path:
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)  # The returned figure stays usable, but pyplot no longer keeps it open
+
 class SupplierVisualizationDashboard:
     """
     Comprehensive visualization suite for supplier segmentation analysis
@@ -25,15 +36,51 @@ class SupplierVisualizationDashboard:
             'Operational': '#45B7D1',    # Blue
             'Transactional': '#96CEB4'   # Green
         }
+        
+        # Segment aggregates shared by several dashboards, computed once per dataset
+        self._risk_pivot = suppliers_data.groupby(['Classification', 'Supply_Risk_Score']).size().unstack(fill_value=0)
+        self._bu_segment = pd.crosstab(suppliers_data['Business_Unit'], suppliers_data['Classification'])
+        self._segment_counts = suppliers_data['Classification'].value_counts()
+        self._segment_frames = dict(list(suppliers_data.groupby('Classification')))
+        
+        # Spend per segment summed on factorized segment codes, in groupby's sorted label order;
+        # rows without a classification (code -1) are dropped, as groupby does
+        segment_ids, segment_labels = pd.factorize(suppliers_data['Classification'], sort=True)
+        classified = segment_ids >= 0
+        self._segment_spend = pd.Series(
+            np.bincount(segment_ids[classified], weights=suppliers_data['Annual_Spend'].to_numpy()[classified],
+                        minlength=len(segment_labels)),
+            index=segment_labels
+        )
+        
+        # Segment display order, and the segments actually present in it
+        self._segment_order = list(self.segment_colors)
+        self._present_segments = [seg for seg in self._segment_order if seg in self._segment_counts.index]
+        
+        # Per-supplier marker colors, gathered from the palette by segment code; code -1 marks a
+        # missing classification (drawn in gray) or a label without a color, which is an error
+        self._segment_codes = pd.Categorical(suppliers_data['Classification'], categories=self._segment_order).codes
+        unknown = (self._segment_codes < 0) & suppliers_data['Classification'].notna().to_numpy()
+        if unknown.any():
+            raise ValueError(f"Unknown supplier classification: {suppliers_data['Classification'][unknown].iloc[0]}")
+        self._palette = np.array(list(self.segment_colors.values()))
+        self._point_colors = np.where(self._segment_codes >= 0, self._palette[self._segment_codes], 'lightgray')
+        
+        # Portfolio spend and the Pareto curve over the 100 largest spends; only those are
+        # plotted, so they are selected with np.partition and just those are sorted
+        spend = suppliers_data['Annual_Spend'].to_numpy()
+        self._total_spend = spend.sum()
+        top_spend = np.partition(spend, len(spend) - 100)[-100:] if len(spend) > 100 else spend
+        self._pareto_pct = np.cumsum(np.sort(top_spend)[::-1]) / self._total_spend * 100
     
-    def create_segmentation_overview(self, save_path=None):
+    def create_segmentation_overview(self, save_path=None, show=True):
         """
         Create overview dashboard with key segmentation metrics
         """
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         
         # 1. Segment Distribution Pie Chart
-        segment_counts = self.data['Classification'].value_counts()
+        segment_counts = self._segment_counts
         colors = [self.segment_colors[seg] for seg in segment_counts.index]
         
         axes[0,0].pie(segment_counts.values, labels=segment_counts.index, 
@@ -42,8 +89,8 @@ class SupplierVisualizationDashboard:
         
         # 2. Score Distribution by Segment
         for segment in self.segment_colors:
-            segment_data = self.data[self.data['Classification'] == segment]
-            if not segment_data.empty:
+            segment_data = self._segment_frames.get(segment)
+            if segment_data is not None:
                 axes[0,1].hist(segment_data['Score'], alpha=0.6, 
                               label=segment, color=self.segment_colors[segment], bins=15)
         axes[0,1].set_xlabel('Score')
@@ -52,8 +99,7 @@ class SupplierVisualizationDashboard:
         axes[0,1].legend()
         
         # 3. Spend Concentration by Segment
-        spend_by_segment = self.data.groupby('Classification')['Annual_Spend'].sum()
-        spend_by_segment = spend_by_segment.reindex(['Strategic', 'Critical', 'Operational', 'Transactional'])
+        spend_by_segment = self._segment_spend.reindex(self._segment_order)
         colors_ordered = [self.segment_colors[seg] for seg in spend_by_segment.index]
         
         bars = axes[1,0].bar(spend_by_segment.index, spend_by_segment.values, color=colors_ordered)
@@ -68,7 +114,7 @@ class SupplierVisualizationDashboard:
                           f'{height/1000:.0f}K', ha='center', va='bottom')
         
         # 4. Business Unit Distribution
-        bu_segment = pd.crosstab(self.data['Business_Unit'], self.data['Classification'])
+        bu_segment = self._bu_segment
         bu_segment.plot(kind='bar', stacked=True, ax=axes[1,1], 
                        color=[self.segment_colors[col] for col in bu_segment.columns])
         axes[1,1].set_title('Segment Distribution by Business Unit', fontweight='bold', fontsize=12)
@@ -78,20 +124,18 @@ class SupplierVisualizationDashboard:
         axes[1,1].legend(title='Segment')
         
         plt.tight_layout()
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        finish_figure(fig, save_path, show)
         
         return fig
     
-    def create_risk_analysis_dashboard(self, save_path=None):
+    def create_risk_analysis_dashboard(self, save_path=None, show=True):
         """
         Create risk analysis visualization dashboard
         """
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         
         # 1. Risk Score Distribution by Segment
-        risk_pivot = self.data.groupby(['Classification', 'Supply_Risk_Score']).size().unstack(fill_value=0)
+        risk_pivot = self._risk_pivot
         risk_pivot.plot(kind='bar', stacked=True, ax=axes[0,0], 
                        color=['lightgreen', 'orange', 'red'])
         axes[0,0].set_title('Supply Risk Distribution by Segment', fontweight='bold')
@@ -101,9 +145,8 @@ class SupplierVisualizationDashboard:
         axes[0,0].tick_params(axis='x', rotation=45)
         
         # 2. Risk vs Spend Scatter Plot
-        scatter_colors = [self.segment_colors[seg] for seg in self.data['Classification']]
         scatter = axes[0,1].scatter(self.data['Supply_Risk_Score'], self.data['Annual_Spend'], 
-                                   c=scatter_colors, alpha=0.6, s=50)
+                                   c=self._point_colors, alpha=0.6, s=50)
         axes[0,1].set_xlabel('Supply Risk Score')
         axes[0,1].set_ylabel('Annual Spend (K)')
         axes[0,1].set_title('Risk vs Spend Analysis', fontweight='bold')
@@ -120,7 +163,7 @@ class SupplierVisualizationDashboard:
         axes[1,0].tick_params(axis='x', rotation=45)
         
         # 4. Risk Heat Map
-        risk_heatmap = self.data.groupby(['Classification', 'Supply_Risk_Score']).size().unstack(fill_value=0)
+        risk_heatmap = self._risk_pivot
         risk_heatmap_pct = risk_heatmap.div(risk_heatmap.sum(axis=1), axis=0) * 100
         
         sns.heatmap(risk_heatmap_pct, annot=True, fmt='.1f', cmap='Reds', 
@@ -129,13 +172,11 @@ class SupplierVisualizationDashboard:
         axes[1,1].set_xlabel('Risk Score')
         
         plt.tight_layout()
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        finish_figure(fig, save_path, show)
         
         return fig
     
-    def create_strategic_insights_chart(self, save_path=None):
+    def create_strategic_insights_chart(self, save_path=None, show=True):
         """
         Create strategic insights visualization
         """
@@ -149,29 +190,17 @@ class SupplierVisualizationDashboard:
         axes[0,0].set_ylabel('Partnership Score')
         
         # 2. Ramp Time Analysis by Segment
-        ramp_time_data = []
-        segments = []
-        for segment in ['Strategic', 'Critical', 'Operational', 'Transactional']:
-            segment_data = self.data[self.data['Classification'] == segment]
-            if not segment_data.empty:
-                ramp_time_data.extend(segment_data['Ramp_Time_Months'].tolist())
-                segments.extend([segment] * len(segment_data))
-        
-        ramp_df = pd.DataFrame({'Segment': segments, 'Ramp_Time': ramp_time_data})
-        sns.boxplot(data=ramp_df, x='Segment', y='Ramp_Time', ax=axes[0,1])
+        sns.boxplot(data=self.data, x='Classification', y='Ramp_Time_Months', order=self._present_segments, ax=axes[0,1])
+        axes[0,1].set_xlabel('Segment')
+        axes[0,1].set_ylabel('Ramp_Time')
         axes[0,1].set_title('Ramp Time Distribution by Segment', fontweight='bold')
         axes[0,1].tick_params(axis='x', rotation=45)
         
         # 3. Spend Pareto Analysis
-        sorted_data = self.data.sort_values('Annual_Spend', ascending=False)
-        sorted_data['cumulative_spend'] = sorted_data['Annual_Spend'].cumsum()
-        total_spend = sorted_data['Annual_Spend'].sum()
-        sorted_data['cumulative_pct'] = sorted_data['cumulative_spend'] / total_spend * 100
+        y_cumulative = self._pareto_pct
+        x_range = np.arange(1, len(y_cumulative) + 1)
         
-        x_range = range(1, min(101, len(sorted_data) + 1))
-        y_cumulative = sorted_data['cumulative_pct'].iloc[:100] if len(sorted_data) >= 100 else sorted_data['cumulative_pct']
-        
-        axes[1,0].plot(x_range[:len(y_cumulative)], y_cumulative, 'b-', linewidth=2)
+        axes[1,0].plot(x_range, y_cumulative, 'b-', linewidth=2)
         axes[1,0].axhline(y=80, color='r', linestyle='--', label='80% Line')
         axes[1,0].set_xlabel('Number of Suppliers (Ranked by Spend)')
         axes[1,0].set_ylabel('Cumulative Spend %')
@@ -181,7 +210,7 @@ class SupplierVisualizationDashboard:
         
         # 4. Segment Score Comparison
         segment_stats = self.data.groupby('Classification')['Score'].agg(['mean', 'std']).fillna(0)
-        segment_stats = segment_stats.reindex(['Strategic', 'Critical', 'Operational', 'Transactional'])
+        segment_stats = segment_stats.reindex(self._segment_order)
         
         x_pos = range(len(segment_stats))
         axes[1,1].bar(x_pos, segment_stats['mean'], 
@@ -194,9 +223,7 @@ class SupplierVisualizationDashboard:
         axes[1,1].set_xticklabels(segment_stats.index, rotation=45)
         
         plt.tight_layout()
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        finish_figure(fig, save_path, show)
         
         return fig
     
@@ -214,7 +241,7 @@ class SupplierVisualizationDashboard:
         )
         
         # 1. Segment Distribution Pie Chart
-        segment_counts = self.data['Classification'].value_counts()
+        segment_counts = self._segment_counts
         fig.add_trace(
             go.Pie(labels=segment_counts.index, values=segment_counts.values,
                   marker_colors=[self.segment_colors[seg] for seg in segment_counts.index],
@@ -224,8 +251,8 @@ class SupplierVisualizationDashboard:
         
         # 2. Score vs Spend Scatter
         for segment in self.segment_colors:
-            segment_data = self.data[self.data['Classification'] == segment]
-            if not segment_data.empty:
+            segment_data = self._segment_frames.get(segment)
+            if segment_data is not None:
                 fig.add_trace(
                     go.Scatter(x=segment_data['Score'], y=segment_data['Annual_Spend'],
                               mode='markers', name=segment,
@@ -235,11 +262,12 @@ class SupplierVisualizationDashboard:
                 )
         
         # 3. Risk Analysis Bar Chart
-        risk_counts = self.data.groupby(['Classification', 'Supply_Risk_Score']).size().reset_index(name='count')
         for risk_score in [1, 2, 3]:
-            risk_data = risk_counts[risk_counts['Supply_Risk_Score'] == risk_score]
+            # Segment counts at this risk score, skipping the zero cells of the pivot
+            risk_data = self._risk_pivot.get(risk_score, pd.Series(dtype='int64'))
+            risk_data = risk_data[risk_data > 0]
             fig.add_trace(
-                go.Bar(x=risk_data['Classification'], y=risk_data['count'],
+                go.Bar(x=risk_data.index, y=risk_data.values,
                       name=f'Risk {risk_score}', showlegend=False),
                 row=2, col=1
             )
@@ -248,7 +276,7 @@ class SupplierVisualizationDashboard:
         fig.add_trace(
             go.Scatter(x=self.data['Innovation_Score'], y=self.data['Partnership_Score'],
                       mode='markers', 
-                      marker=dict(color=[self.segment_colors[seg] for seg in self.data['Classification']],
+                      marker=dict(color=self._point_colors,
                                 size=10, opacity=0.6),
                       name='Suppliers', showlegend=False),
             row=2, col=2
@@ -272,7 +300,7 @@ class SupplierVisualizationDashboard:
         
         return fig
     
-    def generate_executive_summary_chart(self, save_path=None):
+    def generate_executive_summary_chart(self, save_path=None, show=True):
         """
         Create executive summary visualization
         """
@@ -280,7 +308,7 @@ class SupplierVisualizationDashboard:
         
         # Key metrics summary
         total_suppliers = len(self.data)
-        total_spend = self.data['Annual_Spend'].sum()
+        total_spend = self._total_spend
         
         segment_summary = self.data.groupby('Classification').agg({
             'Annual_Spend': ['sum', 'count'],
@@ -316,9 +344,7 @@ class SupplierVisualizationDashboard:
         ax.axvline(x=50, color='gray', linestyle='--', alpha=0.5)
         
         plt.tight_layout()
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        finish_figure(fig, save_path, show)
         
         return fig
 